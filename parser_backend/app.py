@@ -1,10 +1,102 @@
+import hashlib
+import threading
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from parser import evaluate_pseudocode, get_syntax_hints, get_learning_suggestions
+from parser import evaluate_pseudocode, get_syntax_hints, get_learning_suggestions, get_semantic_tokens
+from parser import INPUT_PATTERN, warm_up as warm_up_parser
+from response_encoding import MSGPACK_MIMETYPE, COMPRESSIBLE_ENCODINGS, packb, compress
 
 app = Flask(__name__)
 CORS(app)
 
+# Responses smaller than this are sent uncompressed
+COMPRESSION_THRESHOLD = 1024
+
+class SingleFlight:
+    """Coalesce concurrent identical calls so only one computation runs per key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Run fn() for key, or wait for and share the result of an in-flight call."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except BaseException as e:
+            # Followers must fail too, even on SystemExit or KeyboardInterrupt
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+    def metrics(self):
+        """Counts of executed and coalesced calls."""
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls)
+            }
+
+single_flight = SingleFlight()
+
+# Routes that execute the program rather than only analysing its source
+EXECUTING_ROUTES = ("evaluate", "evaluate-optimized")
+
+def run_coalesced(route, code, fn):
+    """Run fn(code) through the single-flight layer, keyed by route and source hash."""
+    # Executing a program that reads input is not deterministic, so it always runs on its own
+    if route in EXECUTING_ROUTES and INPUT_PATTERN.search(code):
+        return fn(code)
+    key = (route, hashlib.sha256(code.encode("utf-8")).hexdigest())
+    return single_flight.do(key, lambda: fn(code))
+
+@app.after_request
+def encode_response(response):
+    """Apply MessagePack encoding and gzip/deflate compression requested by the client."""
+    if response.direct_passthrough or response.content_encoding:
+        return response
+
+    if response.mimetype == "application/json":
+        response.vary.add("Accept")
+        if request.accept_mimetypes.best_match(["application/json", MSGPACK_MIMETYPE]) == MSGPACK_MIMETYPE:
+            try:
+                response.set_data(packb(response.get_json()))
+                response.mimetype = MSGPACK_MIMETYPE
+            except TypeError:
+                # Values MessagePack cannot represent (e.g. huge integers) stay as JSON
+                pass
+
+    response.vary.add("Accept-Encoding")
+    if len(response.get_data()) < COMPRESSION_THRESHOLD:
+        return response
+    encoding = request.accept_encodings.best_match(COMPRESSIBLE_ENCODINGS)
+    if encoding:
+        response.set_data(compress(response.get_data(), encoding))
+        response.content_encoding = encoding
+    return response
+
 @app.route('/', methods=['GET'])
 def home():
     return "VteacH Pseudo-code Editor Backend is Live!"
@@ -24,7 +116,10 @@ def evaluate():
 
         print(f"[INFO] Code received:\n{code}\n---")
 
-        result = evaluate_pseudocode(code)
+        if data.get("optimize") is True:
+            result = run_coalesced("evaluate-optimized", code, lambda c: evaluate_pseudocode(c, optimize=True))
+        else:
+            result = run_coalesced("evaluate", code, evaluate_pseudocode)
         print(f"[RESULT] {result}")
 
         return jsonify(result)
@@ -49,7 +144,7 @@ def syntax_hints():
                 "message": "No code provided"
             }), 400
 
-        hints = get_syntax_hints(code)
+        hints = run_coalesced("syntax-hints", code, get_syntax_hints)
         return jsonify({
             "status": "success",
             "hints": hints
@@ -61,6 +156,42 @@ def syntax_hints():
             "message": f"Error getting syntax hints: {str(e)}"
         }), 500
 
+@app.route('/tokenize', methods=['POST'])
+def tokenize():
+    """Tokenize code for syntax highlighting using a compact integer encoding."""
+    try:
+        data = request.get_json(force=True)
+        # Leading blank lines are kept so token positions match the editor
+        code = data.get("code", "")
+
+        if not code.strip():
+            return jsonify({
+                "status": "error",
+                "message": "No code provided"
+            }), 400
+
+        start_line = data.get("start_line")
+        end_line = data.get("end_line")
+        for bound in (start_line, end_line):
+            if bound is not None and (not isinstance(bound, int) or isinstance(bound, bool) or bound < 1):
+                return jsonify({
+                    "status": "error",
+                    "message": "start_line and end_line must be positive integers"
+                }), 400
+
+        tokens = get_semantic_tokens(code, start_line, end_line)
+        return jsonify({
+            "status": "success",
+            "legend": tokens["legend"],
+            "data": tokens["data"]
+        })
+
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": f"Error tokenizing code: {str(e)}"
+        }), 500
+
 @app.route('/learning-suggestions', methods=['POST'])
 def learning_suggestions():
     """Get learning suggestions based on the code content."""
@@ -74,7 +205,7 @@ def learning_suggestions():
                 "message": "No code provided"
             }), 400
 
-        suggestions = get_learning_suggestions(code)
+        suggestions = run_coalesced("learning-suggestions", code, get_learning_suggestions)
         return jsonify({
             "status": "success",
             "suggestions": suggestions
@@ -132,5 +263,21 @@ def health_check():
         "version": "1.0.0"
     })
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Request coalescing metrics."""
+    return jsonify({
+        "status": "success",
+        "single_flight": single_flight.metrics()
+    })
+
+def warm_up():
+    """Prime parser caches and Flask's request handling before the first real request."""
+    warm_up_parser()
+    with app.test_client() as client:
+        client.get('/health')
+
+warm_up()
+
 if __name__ == "__main__":
     app.run(debug=True, port=5001)
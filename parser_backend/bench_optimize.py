@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import time
+from parser import evaluate_pseudocode
+
+# Benchmark the optional optimization pass on loop-heavy programs
+programs = {
+    "nested for loops": """
+total = 0
+for i = 1 to 300
+    for j = 1 to 300
+        total = total + i * j
+    endfor
+endfor
+print total
+""",
+    "while loop": """
+counter = 0
+total = 0
+while counter < 100000 do
+    total = total + counter % 7
+    counter = counter + 1
+endwhile
+print total
+""",
+    "array sum": """
+numbers = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+total = 0
+for k = 1 to 10000
+    for i = 0 to 9
+        total = total + numbers[i] * 2 + 1
+    endfor
+endfor
+print total
+""",
+}
+
+def best_time(code, optimize, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = evaluate_pseudocode(code, optimize=optimize)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+for name, code in programs.items():
+    plain_time, plain_result = best_time(code, optimize=False)
+    optimized_time, optimized_result = best_time(code, optimize=True)
+    print(f"{name}:")
+    print(f"  unoptimized: {plain_time * 1000:.1f} ms")
+    print(f"  optimized:   {optimized_time * 1000:.1f} ms ({plain_time / optimized_time:.2f}x)")
+    print(f"  identical results: {plain_result == optimized_result}")
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+import subprocess
+import sys
+
+# Measure cold start: import of the app (including warm-up) to the first response,
+# each run in a fresh interpreter so nothing is cached between runs
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+from app import app
+imported = time.perf_counter()
+client = app.test_client()
+response = client.post('/syntax-hints', json={"code": "x = 10\\nif x > 5\\n    print x\\nendif"})
+assert response.status_code == 200 and response.get_json()["hints"]
+first = time.perf_counter()
+client.post('/syntax-hints', json={"code": "y = 1\\nwhile y < 3\\n    y = y + 1\\nendwhile"})
+second = time.perf_counter()
+print(imported - start, first - imported, second - first)
+"""
+
+def run_once():
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], capture_output=True, text=True, check=True).stdout
+    return [float(value) for value in output.split()[-3:]]
+
+runs = [run_once() for _ in range(5)]
+for label, index in (("import (with warm-up)", 0), ("first response", 1), ("second response", 2)):
+    best = min(run[index] for run in runs)
+    print(f"{label}: {best * 1000:.2f} ms")
+print(f"import to first response: {min(run[0] + run[1] for run in runs) * 1000:.2f} ms")
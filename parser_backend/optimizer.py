@@ -0,0 +1,180 @@
+"""
+Optimization pass for the Python generated by PseudoCodeParser.preprocess_code
+
+Supports:
+- Constant folding of arithmetic, boolean and comparison expressions
+- Dead-branch elimination for if/while statements with constant conditions
+- Running top-level code as a function body so variables become fast locals
+
+Imported lazily by PseudoCodeEvaluator, so the ast module is only loaded
+when optimization is requested.
+"""
+
+import ast
+import operator
+from typing import Any, Optional
+
+class ConstantFolder(ast.NodeTransformer):
+    """Fold constant expressions and drop branches whose condition is a constant."""
+    
+    BINARY_OPERATORS = {
+        ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+        ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod,
+        ast.Pow: operator.pow
+    }
+    UNARY_OPERATORS = {
+        ast.UAdd: operator.pos, ast.USub: operator.neg, ast.Not: operator.not_
+    }
+    COMPARE_OPERATORS = {
+        ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt,
+        ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge
+    }
+    FOLDABLE_TYPES = (bool, int, float, str)
+    
+    def _constant(self, node: ast.AST, value: Any) -> ast.AST:
+        """Replace node with a constant, unless the value is too large to inline."""
+        if not isinstance(value, self.FOLDABLE_TYPES):
+            return node
+        if isinstance(value, int) and value.bit_length() > 128:
+            return node
+        if isinstance(value, str) and len(value) > 1024:
+            return node
+        return ast.copy_location(ast.Constant(value), node)
+    
+    def _is_constant(self, node: ast.AST) -> bool:
+        return isinstance(node, ast.Constant) and isinstance(node.value, self.FOLDABLE_TYPES)
+    
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        op = self.BINARY_OPERATORS.get(type(node.op))
+        if op is None or not (self._is_constant(node.left) and self._is_constant(node.right)):
+            return node
+        if self._result_too_large(node.op, node.left.value, node.right.value):
+            return node
+        try:
+            return self._constant(node, op(node.left.value, node.right.value))
+        except Exception:
+            # Leave errors such as division by zero to be raised at run time
+            return node
+    
+    def _result_too_large(self, op: ast.operator, left: Any, right: Any) -> bool:
+        """Check, before computing it, whether folding would build an oversized constant."""
+        if isinstance(op, ast.Pow):
+            if not (isinstance(left, (int, float)) and isinstance(right, (int, float))):
+                return True
+            if abs(right) > 64:
+                return True
+            return isinstance(left, int) and isinstance(right, int) and abs(left).bit_length() * abs(right) > 128
+        if isinstance(op, ast.Mult):
+            for sequence, count in ((left, right), (right, left)):
+                if isinstance(sequence, str) and isinstance(count, int) and len(sequence) * count > 1024:
+                    return True
+        # String formatting can pad to any width, so only numeric % is folded
+        if isinstance(op, ast.Mod) and isinstance(left, str):
+            return True
+        if isinstance(op, ast.Add) and isinstance(left, str) and isinstance(right, str):
+            return len(left) + len(right) > 1024
+        return False
+    
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        op = self.UNARY_OPERATORS.get(type(node.op))
+        if op is None or not self._is_constant(node.operand):
+            return node
+        try:
+            return self._constant(node, op(node.operand.value))
+        except Exception:
+            return node
+    
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        self.generic_visit(node)
+        if not all(self._is_constant(value) for value in node.values):
+            return node
+        result = node.values[0].value
+        for value in node.values[1:]:
+            if isinstance(node.op, ast.And) and not result:
+                break
+            if isinstance(node.op, ast.Or) and result:
+                break
+            result = value.value
+        return self._constant(node, result)
+    
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        self.generic_visit(node)
+        operands = [node.left] + node.comparators
+        ops = [self.COMPARE_OPERATORS.get(type(op)) for op in node.ops]
+        if None in ops or not all(self._is_constant(operand) for operand in operands):
+            return node
+        try:
+            result = all(op(left.value, right.value) for op, left, right in zip(ops, operands, operands[1:]))
+        except Exception:
+            return node
+        return self._constant(node, result)
+    
+    def visit_IfExp(self, node: ast.IfExp) -> ast.AST:
+        self.generic_visit(node)
+        if not self._is_constant(node.test):
+            return node
+        return node.body if node.test.value else node.orelse
+    
+    def visit_If(self, node: ast.If) -> Any:
+        self.generic_visit(node)
+        if not self._is_constant(node.test):
+            return node
+        return (node.body if node.test.value else node.orelse) or ast.copy_location(ast.Pass(), node)
+    
+    def visit_While(self, node: ast.While) -> Any:
+        self.generic_visit(node)
+        if not self._is_constant(node.test) or node.test.value:
+            return node
+        return node.orelse or ast.copy_location(ast.Pass(), node)
+
+class PseudoCodeOptimizer:
+    """
+    Optional optimization pass over the Python generated by preprocess_code.
+    
+    Constants are folded and dead branches removed, then top-level code is
+    moved into a function body so variables become fast locals. The function
+    returns its locals, which become the final variable snapshot.
+    """
+    
+    ENTRY_POINT = '__pseudo_main__'
+    LOCALS_NAME = '__locals__'
+    
+    # Constructs whose meaning changes once top-level code runs inside a function
+    UNSUPPORTED_NODES = (
+        ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef,
+        ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp,
+        ast.Global, ast.Nonlocal, ast.Return, ast.Yield, ast.YieldFrom, ast.Await,
+        ast.Import, ast.ImportFrom
+    )
+    
+    def optimize(self, code: str) -> Optional[Any]:
+        """Return an optimized code object for code, or None if it must run unoptimized."""
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return None
+        if any(isinstance(node, self.UNSUPPORTED_NODES) for node in ast.walk(tree)):
+            return None
+        if any(isinstance(node, ast.Name) and node.id in (self.ENTRY_POINT, self.LOCALS_NAME)
+               for node in ast.walk(tree)):
+            return None
+        
+        tree = ConstantFolder().visit(tree)
+        body = tree.body or [ast.Pass()]
+        body.append(ast.Return(ast.Call(ast.Name(self.LOCALS_NAME, ast.Load()), [], [])))
+        function = ast.FunctionDef(
+            name=self.ENTRY_POINT,
+            args=ast.arguments(posonlyargs=[], args=[], vararg=None, kwonlyargs=[],
+                               kw_defaults=[], kwarg=None, defaults=[]),
+            body=body,
+            decorator_list=[],
+            returns=None
+        )
+        module = ast.Module(body=[function], type_ignores=[])
+        ast.fix_missing_locations(module)
+        try:
+            return compile(module, '<string>', 'exec')
+        except (SyntaxError, ValueError):
+            return None
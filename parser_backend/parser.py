@@ -16,7 +16,6 @@ Supports:
 import sys
 import io
 import re
-import ast
 import json
 from typing import Dict, List, Any, Tuple, Optional
 from dataclasses import dataclass
@@ -31,7 +30,36 @@ class TokenType(Enum):
     DELIMITER = "delimiter"
     COMMENT = "comment"
 
+# Integer codes used by the compact /tokenize encoding, in TokenType declaration order
+TOKEN_TYPE_CODES = {token_type: code for code, token_type in enumerate(TokenType)}
 
+# Lexical tables shared by every PseudoCodeParser instance
+KEYWORDS = frozenset({
+    'if', 'else', 'endif', 'while', 'endwhile', 'for', 'endfor',
+    'function', 'endfunction', 'procedure', 'endprocedure',
+    'return', 'print', 'input', 'true', 'false', 'null'
+})
+OPERATORS = frozenset({
+    '+', '-', '*', '/', '//', '%', '**', '==', '!=', '<=', '>=', '<', '>',
+    'and', 'or', 'not', '=', '+=', '-=', '*=', '/='
+})
+DELIMITERS = frozenset({',', ';', '(', ')', '[', ']', '{', '}'})
+
+IDENTIFIER_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+INPUT_PATTERN = re.compile(r'\binput\b')
+
+# Small program exercising the common code paths, used by warm_up()
+WARM_UP_CODE = """
+// Warm-up program
+numbers = [1, 2, 3]
+total = 0
+for i = 0 to 2 do
+    total = total + numbers[i]
+endfor
+if total > 5 then
+    print "Total: " + str(total)
+endif
+"""
 
 @dataclass
 class ParserError:
@@ -42,16 +70,9 @@ class ParserError:
 
 class PseudoCodeParser:
     def __init__(self):
-        self.keywords = {
-            'if', 'else', 'endif', 'while', 'endwhile', 'for', 'endfor',
-            'function', 'endfunction', 'procedure', 'endprocedure',
-            'return', 'print', 'input', 'true', 'false', 'null'
-        }
-        self.operators = {
-            '+', '-', '*', '/', '//', '%', '**', '==', '!=', '<=', '>=', '<', '>',
-            'and', 'or', 'not', '=', '+=', '-=', '*=', '/='
-        }
-        self.delimiters = {',', ';', '(', ')', '[', ']', '{', '}'}
+        self.keywords = KEYWORDS
+        self.operators = OPERATORS
+        self.delimiters = DELIMITERS
         
     def tokenize(self, code: str) -> List[Tuple[str, TokenType, int]]:
         """Tokenize the pseudo-code into tokens with line numbers."""
@@ -59,72 +80,95 @@ class PseudoCodeParser:
         lines = code.split('\n')
         
         for line_num, line in enumerate(lines, 1):
-            # Skip empty lines
-            if not line.strip():
-                continue
+            for text, token_type, _ in self._tokenize_line(line):
+                tokens.append((text, token_type, line_num))
                 
-            # Handle comments
-            if line.strip().startswith('//'):
-                tokens.append((line.strip(), TokenType.COMMENT, line_num))
-                continue
+        return tokens
+    
+    def tokenize_spans(self, code: str, start_line: Optional[int] = None,
+                       end_line: Optional[int] = None) -> List[Tuple[int, int, int, TokenType]]:
+        """Tokenize lines start_line..end_line (1-based, inclusive) into (line, column, length, type) spans."""
+        spans = []
+        lines = code.split('\n')
+        first = max(1, start_line or 1)
+        last = min(len(lines), end_line or len(lines))
+        
+        for line_num in range(first, last + 1):
+            for text, token_type, column in self._tokenize_line(lines[line_num - 1]):
+                spans.append((line_num, column, len(text), token_type))
                 
-            # Split line into tokens
-            current_token = ""
-            in_string = False
-            string_delimiter = None
+        return spans
+    
+    def _tokenize_line(self, line: str) -> List[Tuple[str, TokenType, int]]:
+        """Tokenize a single line into (token, type, column) triples."""
+        tokens = []
+        
+        # Skip empty lines
+        if not line.strip():
+            return tokens
             
-            for char in line:
-                if char in ['"', "'"] and not in_string:
-                    in_string = True
-                    string_delimiter = char
-                    if current_token:
-                        tokens.extend(self._process_token(current_token, line_num))
-                        current_token = ""
-                    current_token = char
-                elif char == string_delimiter and in_string:
-                    in_string = False
-                    current_token += char
-                    tokens.append((current_token, TokenType.STRING, line_num))
+        # Handle comments
+        if line.strip().startswith('//'):
+            tokens.append((line.strip(), TokenType.COMMENT, len(line) - len(line.lstrip())))
+            return tokens
+            
+        # Split line into tokens
+        current_token = ""
+        token_start = 0
+        in_string = False
+        string_delimiter = None
+        
+        for column, char in enumerate(line):
+            if char in ['"', "'"] and not in_string:
+                in_string = True
+                string_delimiter = char
+                if current_token:
+                    tokens.append((current_token, self._classify_token(current_token), token_start))
+                current_token = char
+                token_start = column
+            elif char == string_delimiter and in_string:
+                in_string = False
+                current_token += char
+                tokens.append((current_token, TokenType.STRING, token_start))
+                current_token = ""
+                string_delimiter = None
+            elif in_string:
+                current_token += char
+            elif char.isspace():
+                if current_token:
+                    tokens.append((current_token, self._classify_token(current_token), token_start))
                     current_token = ""
-                    string_delimiter = None
-                elif in_string:
-                    current_token += char
-                elif char.isspace():
-                    if current_token:
-                        tokens.extend(self._process_token(current_token, line_num))
-                        current_token = ""
-                elif char in self.delimiters or char in self.operators:
-                    if current_token:
-                        tokens.extend(self._process_token(current_token, line_num))
-                        current_token = ""
-                    tokens.append((char, TokenType.DELIMITER if char in self.delimiters else TokenType.OPERATOR, line_num))
-                else:
-                    current_token += char
-                    
-            if current_token:
-                tokens.extend(self._process_token(current_token, line_num))
+            elif char in self.delimiters or char in self.operators:
+                if current_token:
+                    tokens.append((current_token, self._classify_token(current_token), token_start))
+                    current_token = ""
+                tokens.append((char, TokenType.DELIMITER if char in self.delimiters else TokenType.OPERATOR, column))
+            else:
+                if not current_token:
+                    token_start = column
+                current_token += char
                 
+        if current_token:
+            tokens.append((current_token, self._classify_token(current_token), token_start))
+            
         return tokens
     
-    def _process_token(self, token: str, line_num: int) -> List[Tuple[str, TokenType, int]]:
-        """Process a single token and determine its type."""
-        if not token:
-            return []
-            
+    def _classify_token(self, token: str) -> TokenType:
+        """Determine the type of a single non-string token."""
         # Check if it's a keyword
         if token.lower() in self.keywords:
-            return [(token, TokenType.KEYWORD, line_num)]
+            return TokenType.KEYWORD
             
         # Check if it's a number
         if token.replace('.', '').replace('-', '').isdigit() or token.replace('.', '').replace('-', '').replace('e', '').replace('E', '').isdigit():
-            return [(token, TokenType.NUMBER, line_num)]
+            return TokenType.NUMBER
             
         # Check if it's an operator
         if token in self.operators:
-            return [(token, TokenType.OPERATOR, line_num)]
+            return TokenType.OPERATOR
             
         # Must be an identifier
-        return [(token, TokenType.IDENTIFIER, line_num)]
+        return TokenType.IDENTIFIER
     
     def validate_syntax(self, code: str) -> List[ParserError]:
         """Validate pseudo-code syntax and return errors/warnings."""
@@ -169,7 +213,7 @@ class PseudoCodeParser:
                 if param_str:
                     params = [p.strip() for p in param_str.split(',')]
                     for p in params:
-                        if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", p):
+                        if not IDENTIFIER_PATTERN.match(p):
                             errors.append(ParserError(
                                 line_num,
                                 f"Invalid parameter name: '{p}'",
@@ -347,8 +391,12 @@ class PseudoCodeParser:
         return line
 
 class PseudoCodeEvaluator:
-    def __init__(self):
+    def __init__(self, optimize: bool = False):
         self.parser = PseudoCodeParser()
+        self.optimizer = None
+        if optimize:
+            from optimizer import PseudoCodeOptimizer
+            self.optimizer = PseudoCodeOptimizer()
         self.variables = {}
         self.output_buffer = io.StringIO()
         
@@ -419,7 +467,8 @@ class PseudoCodeEvaluator:
             }
             
             # Execute the code
-            exec(code, exec_globals, self.variables)
+            if not self._execute_optimized(code, exec_globals):
+                exec(code, exec_globals, self.variables)
             
             # Get output
             output = self.output_buffer.getvalue().strip()
@@ -436,19 +485,42 @@ class PseudoCodeEvaluator:
             self.output_buffer.truncate(0)
             self.output_buffer.seek(0)
     
+    def _execute_optimized(self, code: str, exec_globals: Dict[str, Any]) -> bool:
+        """Run code through the optimizer if enabled; return False if it must run unoptimized."""
+        if self.optimizer is None or INPUT_PATTERN.search(code):
+            return False
+        try:
+            compiled = self.optimizer.optimize(code)
+        except Exception:
+            return False
+        if compiled is None:
+            return False
+        
+        namespace = {}
+        try:
+            exec(compiled, dict(exec_globals, **{self.optimizer.LOCALS_NAME: locals}), namespace)
+            self.variables.update(namespace[self.optimizer.ENTRY_POINT]())
+            return True
+        except Exception:
+            # Re-run unoptimized so errors and partial state match the normal path exactly
+            self.variables.clear()
+            self.output_buffer.truncate(0)
+            self.output_buffer.seek(0)
+            return False
 
 
-def evaluate_pseudocode(code: str) -> Dict[str, Any]:
+def evaluate_pseudocode(code: str, optimize: bool = False) -> Dict[str, Any]:
     """
     Main function to evaluate pseudo-code.
     
     Args:
         code: The pseudo-code to evaluate
+        optimize: Run the generated Python through PseudoCodeOptimizer
         
     Returns:
         Dictionary with evaluation results
     """
-    evaluator = PseudoCodeEvaluator()
+    evaluator = PseudoCodeEvaluator(optimize)
     return evaluator.evaluate(code)
 
 def get_syntax_hints(code: str) -> List[Dict[str, str]]:
@@ -467,6 +539,35 @@ def get_syntax_hints(code: str) -> List[Dict[str, str]]:
     
     return hints
 
+def get_semantic_tokens(code: str, start_line: Optional[int] = None,
+                        end_line: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Tokenize code into a compact, LSP-style semantic token encoding.
+    
+    Each token is encoded as four integers: line delta from the previous
+    token (the first token is relative to line 0, so it is its 1-based line),
+    start column, length and token type code (an index into the legend).
+    
+    Args:
+        code: The pseudo-code to tokenize
+        start_line: First line to tokenize (1-based, inclusive)
+        end_line: Last line to tokenize (1-based, inclusive)
+        
+    Returns:
+        Dictionary with the token type legend and the flat integer data array
+    """
+    parser = PseudoCodeParser()
+    data = []
+    previous_line = 0
+    for line_num, column, length, token_type in parser.tokenize_spans(code, start_line, end_line):
+        data.extend((line_num - previous_line, column, length, TOKEN_TYPE_CODES[token_type]))
+        previous_line = line_num
+    
+    return {
+        "legend": [token_type.value for token_type in TokenType],
+        "data": data
+    }
+
 def get_learning_suggestions(code: str) -> List[str]:
     """Get learning suggestions based on the code content."""
     suggestions = []
@@ -485,6 +586,13 @@ def get_learning_suggestions(code: str) -> List[str]:
     
     return suggestions
 
+def warm_up() -> None:
+    """Prime caches on the default code paths before the first request."""
+    get_syntax_hints(WARM_UP_CODE)
+    get_semantic_tokens(WARM_UP_CODE)
+    get_learning_suggestions(WARM_UP_CODE)
+    evaluate_pseudocode(WARM_UP_CODE)
+
 # Example usage and testing
 if __name__ == "__main__":
     # Test the parser with sample pseudo-code
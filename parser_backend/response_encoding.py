@@ -0,0 +1,96 @@
+"""
+Compact response encodings for the Pseudo-code Editor Backend
+
+Supports:
+- MessagePack binary encoding of JSON-compatible results
+- gzip and deflate compression of response bodies
+"""
+
+import gzip
+import struct
+import zlib
+from typing import Any
+
+MSGPACK_MIMETYPE = "application/msgpack"
+COMPRESSIBLE_ENCODINGS = ("gzip", "deflate")
+
+def packb(obj: Any) -> bytes:
+    """Encode a JSON-compatible object as MessagePack."""
+    buffer = bytearray()
+    _pack(obj, buffer)
+    return bytes(buffer)
+
+def _pack(obj: Any, buffer: bytearray) -> None:
+    """Append the MessagePack encoding of obj to buffer."""
+    if obj is None:
+        buffer.append(0xc0)
+    elif obj is True:
+        buffer.append(0xc3)
+    elif obj is False:
+        buffer.append(0xc2)
+    elif isinstance(obj, int):
+        _pack_int(obj, buffer)
+    elif isinstance(obj, float):
+        buffer.append(0xcb)
+        buffer.extend(struct.pack(">d", obj))
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        _pack_header(len(data), buffer, 0xa0, 32, (0xd9, 0xda, 0xdb))
+        buffer.extend(data)
+    elif isinstance(obj, (list, tuple)):
+        _pack_header(len(obj), buffer, 0x90, 16, (None, 0xdc, 0xdd))
+        for item in obj:
+            _pack(item, buffer)
+    elif isinstance(obj, dict):
+        _pack_header(len(obj), buffer, 0x80, 16, (None, 0xde, 0xdf))
+        for key, value in obj.items():
+            _pack(str(key), buffer)
+            _pack(value, buffer)
+    else:
+        raise TypeError(f"Object of type {type(obj).__name__} is not MessagePack serializable")
+
+def _pack_int(value: int, buffer: bytearray) -> None:
+    """Append the smallest MessagePack integer encoding of value."""
+    if 0 <= value < 0x80:
+        buffer.append(value)
+    elif -32 <= value < 0:
+        buffer.extend(struct.pack(">b", value))
+    elif 0 <= value <= 0xff:
+        buffer.extend(struct.pack(">BB", 0xcc, value))
+    elif 0 <= value <= 0xffff:
+        buffer.extend(struct.pack(">BH", 0xcd, value))
+    elif 0 <= value <= 0xffffffff:
+        buffer.extend(struct.pack(">BI", 0xce, value))
+    elif 0 <= value <= 0xffffffffffffffff:
+        buffer.extend(struct.pack(">BQ", 0xcf, value))
+    elif -0x80 <= value < 0:
+        buffer.extend(struct.pack(">Bb", 0xd0, value))
+    elif -0x8000 <= value < 0:
+        buffer.extend(struct.pack(">Bh", 0xd1, value))
+    elif -0x80000000 <= value < 0:
+        buffer.extend(struct.pack(">Bi", 0xd2, value))
+    elif -0x8000000000000000 <= value < 0:
+        buffer.extend(struct.pack(">Bq", 0xd3, value))
+    else:
+        raise TypeError(f"Integer {value} is too large for MessagePack")
+
+def _pack_header(length: int, buffer: bytearray, fix_prefix: int, fix_limit: int, prefixes: tuple) -> None:
+    """Append a str/array/map header using the fix, 8, 16 or 32-bit length form."""
+    prefix8, prefix16, prefix32 = prefixes
+    if length < fix_limit:
+        buffer.append(fix_prefix | length)
+    elif prefix8 is not None and length <= 0xff:
+        buffer.extend(struct.pack(">BB", prefix8, length))
+    elif length <= 0xffff:
+        buffer.extend(struct.pack(">BH", prefix16, length))
+    else:
+        buffer.extend(struct.pack(">BI", prefix32, length))
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress data with a Content-Encoding of gzip or deflate."""
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if encoding == "deflate":
+        # HTTP "deflate" is the zlib format, not a raw deflate stream
+        return zlib.compress(data, 6)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+import ast
+from parser import PseudoCodeParser, evaluate_pseudocode
+from optimizer import ConstantFolder
+
+# Test the optimization pass on generated Python
+test_code = """
+limit = 2 * 5
+total = 0
+for i = 1 to 10 do
+    total = total + i
+endfor
+if 1 > 2 then
+    print "Never printed"
+else
+    print "Total:"
+    print total
+endif
+"""
+
+parser = PseudoCodeParser()
+converted = parser.preprocess_code(test_code)
+
+print("Converted Python code:")
+print(converted)
+print("\nAfter constant folding and dead-branch elimination:")
+print(ast.unparse(ConstantFolder().visit(ast.parse(converted))))
+print("\n---")
+
+# Test that optimized evaluation matches normal evaluation
+result = evaluate_pseudocode(test_code)
+optimized_result = evaluate_pseudocode(test_code, optimize=True)
+print("Evaluation result:")
+print(result)
+print("Optimized evaluation result:")
+print(optimized_result)
+print("Identical:", result == optimized_result)
+print("\n---")
+
+# Test that oversized constants are not built while folding, even in dead branches
+large_code = """
+x = 0
+if x > 1 then
+    y = "%0200000000d" % 1
+endif
+z = 17 % 5
+"""
+
+converted = parser.preprocess_code(large_code)
+print("After constant folding:")
+print(ast.unparse(ConstantFolder().visit(ast.parse(converted))))
+print("Identical:", evaluate_pseudocode(large_code) == evaluate_pseudocode(large_code, optimize=True))
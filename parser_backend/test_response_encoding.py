@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+import json
+from parser import evaluate_pseudocode
+from response_encoding import packb, compress
+
+# Test compact encodings of a large evaluation result
+test_code = """
+numbers = [""" + ", ".join(str(i) for i in range(1000)) + """]
+total = 0
+for i = 0 to 999 do
+    total = total + numbers[i]
+endfor
+print total
+"""
+
+result = evaluate_pseudocode(test_code)
+json_body = json.dumps(result).encode("utf-8")
+msgpack_body = packb(result)
+
+print(f"JSON: {len(json_body)} bytes")
+print(f"JSON + gzip: {len(compress(json_body, 'gzip'))} bytes")
+print(f"JSON + deflate: {len(compress(json_body, 'deflate'))} bytes")
+print(f"MessagePack: {len(msgpack_body)} bytes")
+print(f"MessagePack + gzip: {len(compress(msgpack_body, 'gzip'))} bytes")
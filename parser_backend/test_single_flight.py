@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from app import SingleFlight, run_coalesced, single_flight as app_single_flight
+
+# Test that concurrent identical calls share one computation
+single_flight = SingleFlight()
+calls = []
+
+def slow_evaluate():
+    calls.append(1)
+    time.sleep(0.2)
+    return {"status": "success", "output": "30"}
+
+results = []
+threads = [
+    threading.Thread(target=lambda: results.append(single_flight.do(("evaluate", "hash"), slow_evaluate)))
+    for _ in range(10)
+]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+
+print("Computations run:", len(calls))
+print("Results received:", len(results))
+print("All results shared:", all(result is results[0] for result in results))
+print("Metrics:", single_flight.metrics())
+print("\n---")
+
+# Test that an exception is delivered to every waiter
+single_flight = SingleFlight()
+errors = []
+
+def failing_evaluate():
+    time.sleep(0.2)
+    raise ValueError("evaluation failed")
+
+def call_failing():
+    try:
+        single_flight.do(("evaluate", "hash"), failing_evaluate)
+    except ValueError as e:
+        errors.append(str(e))
+
+threads = [threading.Thread(target=call_failing) for _ in range(10)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+
+print("Errors received:", len(errors), errors[0])
+print("Metrics:", single_flight.metrics())
+print("\n---")
+
+# Test that a BaseException such as KeyboardInterrupt also reaches every waiter
+single_flight = SingleFlight()
+interrupts = []
+
+def interrupted_evaluate():
+    time.sleep(0.2)
+    raise KeyboardInterrupt()
+
+def call_interrupted():
+    try:
+        single_flight.do(("evaluate", "hash"), interrupted_evaluate)
+    except KeyboardInterrupt:
+        interrupts.append(1)
+
+threads = [threading.Thread(target=call_interrupted) for _ in range(10)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+
+print("Interrupts received:", len(interrupts))
+print("Metrics:", single_flight.metrics())
+print("\n---")
+
+# Test that only executing routes skip coalescing for programs that read input
+input_code = "input name\nprint name"
+run_coalesced("evaluate", input_code, lambda code: "evaluated")
+print("After /evaluate (runs on its own):", app_single_flight.metrics())
+run_coalesced("syntax-hints", input_code, lambda code: "hints")
+print("After /syntax-hints (goes through single-flight):", app_single_flight.metrics())
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+
+import json
+from parser import PseudoCodeParser, get_semantic_tokens
+
+# Test the compact token encoding used by /tokenize
+test_code = """
+// Sum the numbers
+numbers = [1, 2, 3, 4, 5]
+total = 0
+for i = 0 to 4 do
+    total = total + numbers[i]
+endfor
+print "Total:"
+print total
+"""
+
+parser = PseudoCodeParser()
+tokens = parser.tokenize(test_code)
+encoded = get_semantic_tokens(test_code)
+
+print("Legend:")
+print(encoded["legend"])
+print("\nEncoded tokens (line delta, column, length, type):")
+data = encoded["data"]
+for i in range(0, len(data), 4):
+    print(data[i:i + 4])
+
+tuple_size = len(json.dumps([(text, token_type.value, line) for text, token_type, line in tokens]))
+encoded_size = len(json.dumps(data))
+print(f"\nList-of-tuples payload: {tuple_size} bytes")
+print(f"Encoded payload: {encoded_size} bytes ({encoded_size / tuple_size:.0%})")
+print("\n---")
+
+# Test tokenizing only a viewport
+viewport = get_semantic_tokens(test_code, start_line=5, end_line=6)
+print("Lines 5-6 only:")
+print(viewport["data"])